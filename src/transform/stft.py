@@ -1,29 +1,186 @@
+import functools
+import os
+
 import numpy as np
 from scipy import signal as ss
 
-def stft(input, fft_size, hop_size=None, window_fn='hann', normalize=False):
-    # window = build_window(fft_size, window_fn=window_fn) # (fft_size,)
-    f, t, output = ss.stft(input, nperseg=fft_size, noverlap=fft_size-hop_size, window=window_fn)
-    
+try:
+    # FFTW caches its plans, which pays off here: the transforms are called
+    # repeatedly on identical shapes (once per reconstruction and basis).
+    # The interfaces default to single-threaded plans, so spread them over
+    # the available cores as well.
+    import pyfftw
+    pyfftw.interfaces.cache.enable()
+    pyfftw.interfaces.cache.set_keepalive_time(60)
+    pyfftw.config.NUM_THREADS = os.cpu_count()
+    fft_module = pyfftw.interfaces.numpy_fft
+except ImportError:
+    fft_module = np.fft
+
+BLOCK_BYTES = 1 << 24 # cap on the windowed-frame scratch per rfft batch
+
+@functools.lru_cache(maxsize=8)
+def _plan(fft_size, hop_size, window_fn):
+    """
+    Per-configuration constants shared by `stft` and `istft`, cached because
+    the transforms are called many times with identical parameters.
+    Returns:
+        window (fft_size,): analysis window
+        scale: analysis scaling factor (window.sum())
+        synthesis (fft_size, 1): synthesis window with the scaling undone
+        window_squared (fft_size,): per-frame overlap-add normalizer term
+    """
+    window = build_window(fft_size, window_fn=window_fn)
+    scale = window.sum()
+    synthesis = (scale * window)[:, np.newaxis]
+    window_squared = window**2
+
+    return window, scale, synthesis, window_squared
+
+@functools.lru_cache(maxsize=8)
+def _overlap_norm(fft_size, hop_size, window_fn, n_frames):
+    """
+    Overlap-added window-power normalizer, cached per frame count: every
+    call with the same STFT configuration rebuilds the same vector.
+    Returns:
+        norm (fft_size + (n_frames - 1) * hop_size,)
+    """
+    _, _, _, window_squared = _plan(fft_size, hop_size, window_fn)
+
+    n_samples = fft_size + (n_frames - 1) * hop_size
+    norm = np.zeros(n_samples)
+
+    for idx in range(n_frames):
+        start = idx * hop_size
+        norm[start: start + fft_size] += window_squared
+
+    return np.where(norm > 1e-10, norm, 1)
+
+_output_buffers = {} # overlap-add accumulators, reused across same-shape calls
+
+def _output_buffer(shape, dtype):
+    """
+    Zeroed overlap-add accumulator for `istft`. The transforms are called
+    repeatedly on identical shapes (once per reconstruction and basis), so
+    the accumulator is cleared with `fill(0)` and reused instead of being
+    reallocated on every call.
+    """
+    key = (shape, np.dtype(dtype).str)
+    output = _output_buffers.get(key)
+
+    if output is None:
+        output = _output_buffers[key] = np.empty(shape, dtype=dtype)
+    output.fill(0)
+
     return output
 
-def istft(input, fft_size, hop_size=None, window_fn='hann', normalize=False, length=None):
-    # window = build_window(fft_size, window_fn=window_fn) # (fft_size,)
-    t, output = ss.istft(input, nperseg=fft_size, noverlap=fft_size-hop_size, window=window_fn)
+def stft(input, fft_size, hop_size=None, window_fn='hann', normalize=False):
+    """
+    Args:
+        input (..., T): real signal
+    Returns:
+        spectrogram (..., fft_size // 2 + 1, n_frames)
+    """
+    if hop_size is None:
+        hop_size = fft_size // 2
+
+    window, scale, _, _ = _plan(fft_size, hop_size, window_fn)
+    # Match the window to the input's precision: the float64 window from
+    # get_window would upcast float32 frames and push the rfft to complex128.
+    window = window.astype(np.result_type(input.dtype, np.float32), copy=False)
+
+    # Center the first frame on t=0 and zero-pad up to a whole number of
+    # frames, like scipy.signal.stft(boundary='zeros', padded=True).
+    pad_left = fft_size // 2
+    n_samples = input.shape[-1] + 2 * pad_left
+    pad_right = pad_left + (-(n_samples - fft_size)) % hop_size
+    padding = [(0, 0)] * (input.ndim - 1) + [(pad_left, pad_right)]
+    signal = np.pad(input, padding, mode='constant')
+
+    frames = np.lib.stride_tricks.sliding_window_view(signal, fft_size, axis=-1)[..., ::hop_size, :] # (..., n_frames, fft_size), view
+    n_frames = frames.shape[-2]
+    batch_shape = frames.shape[:-2]
+
+    spectrogram = np.empty(batch_shape + (fft_size // 2 + 1, n_frames), dtype=np.result_type(signal.dtype, np.complex64))
+
+    # Transform a bounded block of frames at a time: the windowed copy then
+    # stays cache-resident instead of materializing every frame at once.
+    frame_bytes = int(np.prod(batch_shape, dtype=int)) * fft_size * signal.dtype.itemsize
+    block_size = max(1, BLOCK_BYTES // frame_bytes)
+
+    for start in range(0, n_frames, block_size):
+        block = slice(start, min(start + block_size, n_frames))
+        # rfft keeps only the fft_size // 2 + 1 nonnegative-frequency bins, so
+        # the redundant conjugate half of each real frame is never computed.
+        spectrogram[..., block] = fft_module.rfft(frames[..., block, :] * window, n=fft_size, axis=-1).swapaxes(-1, -2)
+
+    spectrogram /= scale
+
+    return spectrogram
+
+def istft(input, fft_size, hop_size=None, window_fn='hann', normalize=False, length=None, reuse_buffer=False):
+    """
+    Args:
+        input (..., fft_size // 2 + 1, n_frames): spectrogram from `stft`
+        reuse_buffer: draw the overlap-add accumulator from a shared
+            per-shape cache instead of allocating it. The returned signal is
+            then a view the next same-shape call overwrites, so only enable
+            this when the result is consumed before that (hot loops that
+            invert many same-shape spectrograms).
+    Returns:
+        output (..., T)
+    """
+    if hop_size is None:
+        hop_size = fft_size // 2
+
+    _, _, synthesis, _ = _plan(fft_size, hop_size, window_fn)
+
+    frames = fft_module.irfft(input, n=fft_size, axis=-2) # (..., fft_size, n_frames)
+    frames *= synthesis # undo the analysis scaling, apply the synthesis window
+
+    n_frames = frames.shape[-1]
+    n_samples = fft_size + (n_frames - 1) * hop_size
+    if reuse_buffer:
+        output = _output_buffer(frames.shape[:-2] + (n_samples,), input.real.dtype) # complex64 in -> float32 out
+    else:
+        output = np.zeros(frames.shape[:-2] + (n_samples,), dtype=input.real.dtype)
+
+    # Contiguous-slice += overlap-add: each frame lands as one vectorized add
+    for idx in range(n_frames):
+        start = idx * hop_size
+        output[..., start: start + fft_size] += frames[..., idx]
+
+    output /= _overlap_norm(fft_size, hop_size, window_fn, n_frames)
+
+    # Remove the centering padding added by `stft`
+    pad_left = fft_size // 2
+    output = output[..., pad_left: n_samples - pad_left]
 
     if length is not None:
-        output = output[...,:length]
-    
+        output = output[..., :length]
+
     return output
     
+def istft_batch(input, fft_size, hop_size=None, window_fn='hann', normalize=False, length=None, reuse_buffer=False):
+    """
+    Invert a stack of spectrograms in one call: a single batched irfft over
+    the whole stack and one overlap-add pass, instead of a Python-level loop
+    of per-spectrogram `istft` calls.
+    Args:
+        input (batch, fft_size // 2 + 1, n_frames)
+    Returns:
+        output (batch, T)
+    """
+    return istft(input, fft_size, hop_size=hop_size, window_fn=window_fn, normalize=normalize, length=length, reuse_buffer=reuse_buffer)
+
 def build_window(fft_size, window_fn='hann'):
-    if window_fn == 'hann':
-        window = ss.hann(fft_size, sym=False)
-    elif window_fn == 'hamming':
-        window = ss.hamming(fft_size, sym=False)
-    else:
+    if window_fn not in ['hann', 'hamming']:
         raise ValueError("Not support {} window.".format(window_fn))
-        
+
+    # ss.hann / ss.hamming were removed in scipy 1.13; get_window with
+    # fftbins=True is the periodic (sym=False) window on every version.
+    window = ss.get_window(window_fn, fft_size, fftbins=True)
+
     return window
 
 def build_optimal_window(window, hop_size=None):